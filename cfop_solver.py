@@ -0,0 +1,557 @@
+#cfop_solver.py
+
+import argparse
+import heapq
+import multiprocessing
+import random
+import time
+
+import facelets
+from cube import invert_move
+
+'''
+a human style, layer by layer (CFOP) solver: cross on D, the four F2L pairs, then OLL and PLL
+on U. every step is a lookup in a table that is built once from the facelet permutations:
+
+    cross - distance to solved for every placement of the 4 cross edges, walked downhill
+    F2L   - per slot, the cheapest U turn / trigger sequence for every (corner, edge) case
+    OLL   - the cheapest chain of known OLL algorithms for every top orientation pattern
+    PLL   - the cheapest chain of known PLL algorithms for every top permutation
+
+internally the solver tracks stickers rather than colours: state[i] is the home slot of the
+sticker currently at slot i, so a piece can be found with state.index(home_slot)
+'''
+
+FACE_MOVES = [
+    "R", "R'", "R2",
+    "L", "L'", "L2",
+    "U", "U'", "U2",
+    "D", "D'", "D2",
+    "F", "F'", "F2",
+    "B", "B'", "B2"
+]
+
+AUF_MOVES = ["U", "U'", "U2"]
+
+#wide moves are written out as face + slice (r == R M')
+OLL_ALGORITHMS = [
+    "R U R' U R U2 R'",
+    "R U2 R' U' R U' R'",
+    "R U2 R' U' R U R' U' R U' R'",
+    "R U2 R2 U' R2 U' R2 U2 R",
+    "R2 D R' U2 R D' R' U2 R'",
+    "R M' U R' U' R' M F R F'",
+    "F R' F' R M' U R U' R' M",
+    "F R U R' U' F'",
+    "F U R U' R' F'",
+    "F R U R' U' R U R' U' F'",
+    "M' U M U2 M' U M",
+    "R U R' U' R' F R F'",
+]
+
+PLL_ALGORITHMS = [
+    "R U R' U' R' F R2 U' R' U' R U R' F'",
+    "R U R' F' R U R' U' R' F R2 U' R'",
+    "R' U L' U2 R U' R' U2 R L",
+    "R U' R U R U R U' R' U' R2",
+    "R2 U R U R' U' R' U' R' U R'",
+    "M2 U M2 U2 M2 U M2",
+    "M' U M2 U M2 U M' U2 M2",
+    "F R U' R' U' R U R' F' R U R' U' R' F R F'",
+    "R' F R' B2 R F' R' B2 R2",
+    "R B' R F2 R' B R F2 R2",
+]
+
+#name: (corner position, edge position, the two side faces of the slot)
+F2L_SLOTS = {
+    'FR': ((1, -1, 1), (1, 0, 1), ('R', 'F')),
+    'FL': ((-1, -1, 1), (-1, 0, 1), ('L', 'F')),
+    'BR': ((1, -1, -1), (1, 0, -1), ('R', 'B')),
+    'BL': ((-1, -1, -1), (-1, 0, -1), ('L', 'B')),
+}
+
+_TOP_LAYER = frozenset(i for i, (position, face) in enumerate(facelets.SLOTS) if position[1] == 1)
+
+#where the sticker at slot j ends up after each move
+_DEST = {move: facelets.invert(perm) for move, perm in facelets.MOVES.items()}
+
+def invert_sequence(moves):
+    return [invert_move(move) for move in reversed(moves)]
+
+def simplify(moves):
+    #merge neighbouring turns of the same layer (R R -> R2, R R' -> nothing)
+    quarter_turns = {'': 1, '2': 2, "'": 3}
+    suffixes = {1: '', 2: '2', 3: "'"}
+    stack = []
+    for move in moves:
+        face, turns = move[0], quarter_turns[move[1:]]
+        if stack and stack[-1][0] == face:
+            turns = (stack.pop()[1] + turns) % 4
+            if turns == 0:
+                continue
+        stack.append((face, turns))
+    return [face + suffixes[turns] for face, turns in stack]
+
+def _cheapest_words(start, generators, step):
+    """
+    dijkstra over every key reachable from start
+    generators: list of move lists, each costs its length
+    step: function (key, move list) -> new key
+    returns: key -> the moves that lead back to start from that key
+    """
+    best = {start: (0, [])}
+    queue = [(0, 0, start)]
+    counter = 1
+    while queue:
+        cost, _, key = heapq.heappop(queue)
+        if cost > best[key][0]:
+            continue
+        for word in generators:
+            new_key = step(key, word)
+            new_cost = cost + len(word)
+            if new_key not in best or new_cost < best[new_key][0]:
+                best[new_key] = (new_cost, best[key][1] + word)
+                heapq.heappush(queue, (new_cost, counter, new_key))
+                counter += 1
+    return {key: invert_sequence(path) for key, (cost, path) in best.items()}
+
+def _step_pair(key, moves):
+    #move the tracked (corner, edge) stickers of an F2L pair
+    corner, edge = key
+    for move in moves:
+        corner, edge = _DEST[move][corner], _DEST[move][edge]
+    return corner, edge
+
+def _preserves(perm, allowed):
+    #True if every sticker outside `allowed` stays where it is
+    return all(perm[i] == i for i in range(len(perm)) if i not in allowed)
+
+class CrossTable:
+    def __init__(self):
+        #home slots of the D coloured stickers on the 4 D edges
+        self.stickers = [facelets.SLOT_INDEX[(position, 'y-')] for position in
+                         ((0, -1, 1), (1, -1, 0), (0, -1, -1), (-1, -1, 0))]
+
+        edge_slots = [i for i, (position, face) in enumerate(facelets.SLOTS)
+                      if sum(abs(v) for v in position) == 2]
+        self.edge_index = {slot: n for n, slot in enumerate(edge_slots)}
+        self.edge_slots = edge_slots
+
+        #per move, the new compact index of every edge sticker, pre-multiplied per digit
+        size = len(edge_slots)
+        self.moves = {}
+        for move in FACE_MOVES:
+            dest = [self.edge_index[_DEST[move][slot]] for slot in edge_slots]
+            self.moves[move] = [[d * size ** (3 - digit) for d in dest] for digit in range(4)]
+
+        self.solved = self.encode([self.edge_index[slot] for slot in self.stickers])
+        self.distance = self.build()
+
+    def encode(self, digits):
+        a, b, c, d = digits
+        size = len(self.edge_slots)
+        return ((a * size + b) * size + c) * size + d
+
+    def decode(self, key):
+        size = len(self.edge_slots)
+        key, d = divmod(key, size)
+        key, c = divmod(key, size)
+        a, b = divmod(key, size)
+        return a, b, c, d
+
+    def step(self, key, move):
+        a, b, c, d = self.decode(key)
+        ta, tb, tc, td = self.moves[move]
+        return ta[a] + tb[b] + tc[c] + td[d]
+
+    def build(self):
+        #breadth first search from the solved cross over every placement of the 4 edges
+        distance = bytearray([255]) * len(self.edge_slots) ** 4
+        distance[self.solved] = 0
+        frontier = [self.solved]
+        depth = 0
+        tables = [self.moves[move] for move in FACE_MOVES]
+        size = len(self.edge_slots)
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for key in frontier:
+                rest, d = divmod(key, size)
+                rest, c = divmod(rest, size)
+                a, b = divmod(rest, size)
+                for ta, tb, tc, td in tables:
+                    new_key = ta[a] + tb[b] + tc[c] + td[d]
+                    if distance[new_key] == 255:
+                        distance[new_key] = depth
+                        next_frontier.append(new_key)
+            frontier = next_frontier
+        return distance
+
+    def key(self, state):
+        return self.encode([self.edge_index[state.index(sticker)] for sticker in self.stickers])
+
+    def solve(self, state):
+        key = self.key(state)
+        moves = []
+        distance = self.distance
+        while distance[key]:
+            a, b, c, d = self.decode(key)
+            for move in FACE_MOVES:
+                ta, tb, tc, td = self.moves[move]
+                new_key = ta[a] + tb[b] + tc[c] + td[d]
+                if distance[new_key] < distance[key]:
+                    moves.append(move)
+                    key = new_key
+                    break
+        return moves
+
+class F2LTable:
+    def __init__(self):
+        self.slots = {}
+        for name, (corner, edge, faces) in F2L_SLOTS.items():
+            corner_sticker = facelets.SLOT_INDEX[(corner, 'y-')]
+            edge_sticker = facelets.SLOT_INDEX[(edge, next(face for face in facelets.FACE_ORDER
+                                                           if (edge, face) in facelets.SLOT_INDEX))]
+            allowed = _TOP_LAYER | {i for i, (position, face) in enumerate(facelets.SLOTS)
+                                    if position in (corner, edge)}
+
+            #R U R' style inserts that only touch the top layer and this slot
+            triggers = []
+            for face in faces:
+                for first in (face, face + "'"):
+                    for auf in AUF_MOVES:
+                        word = [first, auf, invert_move(first)]
+                        if _preserves(facelets.sequence_permutation(word), allowed):
+                            triggers.append(word)
+
+            generators = [[move] for move in AUF_MOVES] + triggers
+
+            self.slots[name] = {
+                'pieces': (corner, edge),
+                'stickers': (corner_sticker, edge_sticker),
+                'triggers': triggers,
+                'cases': _cheapest_words((corner_sticker, edge_sticker), generators, _step_pair),
+            }
+
+    def is_solved(self, state, name):
+        corner_sticker, edge_sticker = self.slots[name]['stickers']
+        return state[corner_sticker] == corner_sticker and state[edge_sticker] == edge_sticker
+
+    def pair_moves(self, state, name, unsolved):
+        """
+        moves that solve the pair for slot `name` without touching solved slots
+        pieces sitting in another unsolved slot are pulled out to the top layer first
+        """
+        slot = self.slots[name]
+        key = tuple(state.index(sticker) for sticker in slot['stickers'])
+        moves = []
+
+        stuck = self._stuck_in(key, name, unsolved)
+        while stuck:
+            #a trigger only touches the top layer and its own slot, so this ends after 2 rounds
+            for trigger in stuck['triggers']:
+                new_key = _step_pair(key, trigger)
+                if all(facelets.SLOTS[i][0] not in stuck['pieces'] for i in new_key):
+                    break
+            else:
+                raise RuntimeError(f"cannot free the {name} pair")
+            moves += trigger
+            key = new_key
+            stuck = self._stuck_in(key, name, unsolved)
+
+        if key not in slot['cases']:
+            raise RuntimeError(f"no F2L case for slot {name}")
+        return moves + slot['cases'][key]
+
+    def _stuck_in(self, key, name, unsolved):
+        #the other unsolved slot holding one of these pieces, if any
+        for other in unsolved:
+            if other == name:
+                continue
+            if any(facelets.SLOTS[i][0] in self.slots[other]['pieces'] for i in key):
+                return self.slots[other]
+        return None
+
+class LastLayerTable:
+    def __init__(self, algorithms, key):
+        """
+        algorithms: last layer algorithms the table may chain together
+        key: function colour state -> 54 tuple holding only what this step cares about
+        """
+        self.key = key
+        generators = [[move] for move in AUF_MOVES]
+        for algorithm in algorithms:
+            word = algorithm.split()
+            generators += [word, invert_sequence(word)]
+
+        perms = {}
+        def step(state, word):
+            name = ' '.join(word)
+            if name not in perms:
+                perms[name] = facelets.sequence_permutation(word)
+            return facelets.apply(state, perms[name])
+
+        self.cases = _cheapest_words(key(facelets.SOLVED), generators, step)
+
+    def solve(self, colours):
+        moves = self.cases.get(self.key(colours))
+        if moves is None:
+            raise RuntimeError("unrecognised last layer case")
+        return moves
+
+def _orientation_key(colours):
+    #only whether each sticker shows the U colour, so every permutation shares one case
+    up = colours[facelets.CENTERS[0]]
+    return tuple(colour == up for colour in colours)
+
+def _permutation_key(colours):
+    return colours
+
+class SolveStep:
+    def __init__(self, name, moves, seconds):
+        self.name = name
+        self.moves = moves
+        self.seconds = seconds
+
+    def __repr__(self):
+        return f"SolveStep({self.name}, {len(self.moves)} moves, {self.seconds * 1000:.2f}ms)"
+
+class Solution:
+    def __init__(self, steps):
+        self.steps = steps
+
+    @property
+    def moves(self):
+        return [move for step in self.steps for move in step.moves]
+
+    @property
+    def seconds(self):
+        return sum(step.seconds for step in self.steps)
+
+    def print_steps(self):
+        print("=== SOLUTION ===")
+        for step in self.steps:
+            print(f"{step.name:<6} ({len(step.moves):>2} moves, {step.seconds * 1000:6.2f}ms): {' '.join(step.moves)}")
+        print(f"total: {len(self.moves)} moves in {self.seconds * 1000:.2f}ms")
+        print("================")
+
+def _normal(face):
+    #'x+' -> (1, 0, 0)
+    sign = 1 if face[1] == '+' else -1
+    return tuple(sign if axis == face[0] else 0 for axis in 'xyz')
+
+def _corner_order(faces):
+    #the faces of a corner starting from its U/D face, turning the same way round on every corner
+    top = next(face for face in faces if face[0] == 'y')
+    a, b = [face for face in faces if face != top]
+    n, u, v = _normal(top), _normal(a), _normal(b)
+    triple = (n[0] * (u[1] * v[2] - u[2] * v[1]) - n[1] * (u[0] * v[2] - u[2] * v[0])
+              + n[2] * (u[0] * v[1] - u[1] * v[0]))
+    return [top, a, b] if triple > 0 else [top, b, a]
+
+def _is_primary(face, position):
+    #the sticker that decides edge orientation: U/D if the edge has one, otherwise F/B
+    if position[1] != 0:
+        return face[0] == 'y'
+    return face[0] == 'z'
+
+def _parity(order):
+    #0 for an even permutation, 1 for odd
+    seen = set()
+    parity = 0
+    for start in range(len(order)):
+        length = 0
+        i = start
+        while i not in seen:
+            seen.add(i)
+            i = order[i]
+            length += 1
+        if length:
+            parity ^= (length - 1) & 1
+    return parity
+
+class CFOPSolver:
+    def __init__(self):
+        #building the tables takes well under a second, still do it once and reuse the solver
+        self.cross = CrossTable()
+        self.f2l = F2LTable()
+        self.oll = LastLayerTable(OLL_ALGORITHMS, _orientation_key)
+        self.pll = LastLayerTable(PLL_ALGORITHMS, _permutation_key)
+
+        #colour set of each piece -> {colour: home slot}, to turn colours back into stickers
+        self.pieces = {}
+        self.piece_slots = {}
+        for i, (position, face) in enumerate(facelets.SLOTS):
+            self.piece_slots.setdefault(position, []).append(i)
+        for position, slots in self.piece_slots.items():
+            colours = {facelets.SOLVED[i]: i for i in slots}
+            self.pieces[frozenset(colours)] = colours
+
+        #lookups for is_solvable, all indexed by sticker slot
+        corners = [position for position, slots in self.piece_slots.items() if len(slots) == 3]
+        edges = [position for position, slots in self.piece_slots.items() if len(slots) == 2]
+        #each corner's slots, U/D face first and going round the same way on every corner
+        self.corner_slots = [
+            [facelets.SLOT_INDEX[(position, face)] for face in
+             _corner_order([facelets.SLOTS[i][1] for i in self.piece_slots[position]])]
+            for position in corners
+        ]
+        #each edge's deciding slot (U/D if it has one, otherwise F/B)
+        self.edge_slots = [
+            next(i for i in self.piece_slots[position] if _is_primary(facelets.SLOTS[i][1], position))
+            for position in edges
+        ]
+        self.corner_of = {}
+        self.edge_of = {}
+        for n, position in enumerate(corners):
+            for i in self.piece_slots[position]:
+                self.corner_of[i] = n
+        for n, position in enumerate(edges):
+            for i in self.piece_slots[position]:
+                self.edge_of[i] = n
+        self.is_up_down = [face[0] == 'y' for position, face in facelets.SLOTS]
+        self.is_primary = [_is_primary(face, position) for position, face in facelets.SLOTS]
+
+    def to_stickers(self, colours):
+        #colour state (facelets.from_cube) -> sticker state, centers must be in their home spots
+        if any(colours[i] != facelets.SOLVED[i] for i in facelets.CENTERS):
+            raise ValueError("cube must be in its home orientation (centers unmoved)")
+        state = [None] * len(colours)
+        for position, slots in self.piece_slots.items():
+            home = self.pieces.get(frozenset(colours[i] for i in slots))
+            if home is None or len(home) != len(slots):
+                raise ValueError(f"invalid piece at {position}")
+            for i in slots:
+                state[i] = home[colours[i]]
+        state = tuple(state)
+        if not self.is_solvable(state):
+            raise ValueError("unsolvable cube")
+        return state
+
+    def is_solvable(self, state):
+        """
+        state: sticker state
+        returns: True if every piece appears once, corner twists add up to a multiple of 3,
+            edge flips to a multiple of 2, and corner and edge permutations have the same parity
+        """
+        corner_order = [self.corner_of[state[slots[0]]] for slots in self.corner_slots]
+        edge_order = [self.edge_of[state[slot]] for slot in self.edge_slots]
+        if len(set(corner_order)) != len(corner_order) or len(set(edge_order)) != len(edge_order):
+            return False
+
+        twist = sum(n for slots in self.corner_slots for n, i in enumerate(slots) if self.is_up_down[state[i]])
+        if twist % 3:
+            return False
+
+        #an edge is flipped when its deciding sticker is not on the deciding slot
+        flip = sum(1 for slot in self.edge_slots if not self.is_primary[state[slot]])
+        if flip % 2:
+            return False
+
+        return _parity(corner_order) == _parity(edge_order)
+
+    def solve(self, colours):
+        """
+        colours: a colour state, e.g. facelets.from_cube(cube)
+        returns: Solution with one SolveStep per stage
+        """
+        state = self.to_stickers(colours)
+        steps = []
+
+        def finish(name, moves, started):
+            nonlocal state
+            moves = simplify(moves)
+            state = facelets.apply(state, facelets.sequence_permutation(moves))
+            steps.append(SolveStep(name, moves, time.perf_counter() - started))
+
+        started = time.perf_counter()
+        finish("cross", self.cross.solve(state), started)
+
+        #every slot gets a step, one that is already solved just comes back empty
+        unsolved = list(F2L_SLOTS)
+        while unsolved:
+            started = time.perf_counter()
+            #take whichever pair is cheapest right now
+            options = [(self.f2l.pair_moves(state, name, unsolved), name) for name in unsolved]
+            moves, name = min(options, key=lambda option: len(option[0]))
+            unsolved.remove(name)
+            finish(f"F2L {name}", moves, started)
+
+        started = time.perf_counter()
+        finish("OLL", self.oll.solve(facelets.apply(facelets.SOLVED, state)), started)
+
+        started = time.perf_counter()
+        finish("PLL", self.pll.solve(facelets.apply(facelets.SOLVED, state)), started)
+
+        if state != facelets.IDENTITY:
+            raise RuntimeError("solver finished on an unsolved cube")
+        return Solution(steps)
+
+    def solve_scramble(self, scramble):
+        return self.solve(facelets.apply_sequence(facelets.SOLVED, scramble))
+
+    def solve_batch(self, scrambles, jobs=None, chunksize=64):
+        """
+        scrambles: iterable of move lists
+        jobs: worker processes, None for all cores, 1 to solve in this process
+        returns: list of Solutions, in the same order
+        """
+        if jobs == 1:
+            return [self.solve_scramble(scramble) for scramble in scrambles]
+
+        #each worker gets a copy of this solver once, so the tables are not rebuilt
+        with multiprocessing.Pool(jobs, initializer=_init_worker, initargs=(self,)) as pool:
+            return pool.map(_solve_in_worker, scrambles, chunksize)
+
+#the solver each batch worker process uses
+_worker_solver = None
+
+def _init_worker(solver):
+    global _worker_solver
+    _worker_solver = solver
+
+def _solve_in_worker(scramble):
+    return _worker_solver.solve_scramble(scramble)
+
+def random_scramble(length=25):
+    return [random.choice(FACE_MOVES) for _ in range(length)]
+
+def print_batch_summary(solutions, seconds):
+    print("=== BATCH ===")
+    print(f"solved {len(solutions)} scrambles in {seconds:.2f}s ({len(solutions) / seconds:.0f}/s)")
+    totals = {}
+    for solution in solutions:
+        for step in solution.steps:
+            name = "F2L" if step.name.startswith("F2L") else step.name
+            moves, step_seconds = totals.get(name, (0, 0))
+            totals[name] = (moves + len(step.moves), step_seconds + step.seconds)
+    for name, (moves, step_seconds) in totals.items():
+        print(f"{name:<6} avg {moves / len(solutions):5.1f} moves, {step_seconds / len(solutions) * 1000:.3f}ms")
+    average = sum(len(solution.moves) for solution in solutions) / len(solutions)
+    print(f"total  avg {average:5.1f} moves")
+    print("=============")
+
+def main():
+    parser = argparse.ArgumentParser(description="layer by layer (CFOP) solver")
+    parser.add_argument('scramble', nargs='?', help="e.g. \"R U R' U'\", random if left out")
+    parser.add_argument('--batch', type=int, default=0, help="solve this many random scrambles")
+    parser.add_argument('--jobs', type=int, default=None, help="worker processes for --batch (default: all cores)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    solver = CFOPSolver()
+    print(f"tables built in {time.perf_counter() - started:.2f}s")
+
+    if args.batch:
+        scrambles = [random_scramble() for _ in range(args.batch)]
+        started = time.perf_counter()
+        solutions = solver.solve_batch(scrambles, args.jobs)
+        print_batch_summary(solutions, time.perf_counter() - started)
+        return
+
+    scramble = args.scramble.split() if args.scramble else random_scramble()
+    print("Scramble: " + " ".join(scramble))
+    solver.solve_scramble(scramble).print_steps()
+
+if __name__ == "__main__":
+    main()
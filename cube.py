@@ -4,6 +4,14 @@ import random
 
 #implementing the basic representation of each cubie (piece) and the cube as a whole
 
+def invert_move(move_str):
+    #R -> R', R' -> R, R2 -> R2 (works for slices and full rotations too)
+    if move_str.endswith("'"):
+        return move_str[:-1]
+    if move_str.endswith("2"):
+        return move_str
+    return move_str + "'"
+
 class Cubie:
     def __init__(self, position, faces):
         """
@@ -90,13 +98,10 @@ class Cubie:
             self.faces = new_faces
             
             #rotate center label if it has one
+            #every pass of this loop is a single forward quarter turn (prime is 3 of them)
             if self.center_label:
                 rot = self.LABEL_ROTATIONS.get(axis, {})
-                if direction > 0:
-                    self.center_label = rot.get(self.center_label, self.center_label)
-                else: #prime rotation
-                    inv = {v: k for k, v in rot.items()}
-                    self.center_label = inv.get(self.center_label, self.center_label)
+                self.center_label = rot.get(self.center_label, self.center_label)
         
     #apply a vector transformation according to the axis we rotate around
     def rotate_pos(self, pos, axis):
@@ -234,6 +239,23 @@ class Cube:
             for cubie in self.cubies:
                 cubie.transform(operation)
     
+    def get_state(self):
+        """
+        returns: a compact, immutable snapshot of every cubie
+        one (position, faces, center_label) tuple per cubie, in self.cubies order
+        """
+        return tuple(
+            (cubie.position, tuple(cubie.faces.items()), cubie.center_label)
+            for cubie in self.cubies
+        )
+
+    def set_state(self, state):
+        #restore a snapshot taken with get_state(), cubies are matched by index
+        for cubie, (position, faces, center_label) in zip(self.cubies, state):
+            cubie.position = position
+            cubie.faces = dict(faces)
+            cubie.center_label = center_label
+
     def dump_cubies(self):
         print("=== CUBIE DUMP ===")
         for cubie in sorted(self.cubies, key=lambda c: c.position):
@@ -312,7 +334,8 @@ class Cube:
 
         print("================")
         
-    def random_scramble(self, length=30):
+    def scramble_moves(self, length=30):
+        #a random scramble as a list of moves, without applying it
         SCRAMBLE_MOVES = [
             "R", "R'", "R2",
             "L", "L'", "L2",
@@ -321,9 +344,11 @@ class Cube:
             "F", "F'", "F2",
             "B", "B'", "B2"
         ]
+        return [random.choice(SCRAMBLE_MOVES) for _ in range(length)]
+
+    def random_scramble(self, length=30):
         scramble = ""
-        for _ in range(length):
-            move = random.choice(SCRAMBLE_MOVES)
+        for move in self.scramble_moves(length):
             self.rotate(move)
             scramble += (move + " ")
         print("Scramble: " + scramble)
@@ -0,0 +1,119 @@
+#facelets.py
+
+from cube import Cube
+
+'''
+a flat, fast representation of the cube for bulk work (checking algorithm libraries, solving).
+a state is a tuple of 54 sticker colours, 9 per face in U R F D L B order, each face read row by
+row like get_face_grid(). every move in Cube.MOVE_MAP is turned into a permutation of those 54
+indices once, by labelling the stickers of a real Cube and turning it, so applying a move is a
+single tuple rebuild instead of transforming all 26 cubies
+'''
+
+FACE_ORDER = ('y+', 'x+', 'z+', 'y-', 'x-', 'z-')
+
+#index of the center sticker on each face
+CENTERS = tuple(9 * i + 4 for i in range(6))
+
+def _labelled_cube():
+    #a cube whose stickers are their own (position, face) slot instead of a colour
+    cube = Cube()
+    for cubie in cube.cubies:
+        cubie.faces = {face: (cubie.position, face) for face in cubie.faces}
+    return cube
+
+def _build_slots():
+    cube = _labelled_cube()
+    slots = []
+    for face in FACE_ORDER:
+        for row in cube.get_face_grid(face):
+            slots.extend(row)
+    return tuple(slots)
+
+#sticker index -> (cubie position, face) and back
+SLOTS = _build_slots()
+SLOT_INDEX = {slot: i for i, slot in enumerate(SLOTS)}
+
+IDENTITY = tuple(range(len(SLOTS)))
+
+def _build_moves():
+    moves = {}
+    for move in Cube().MOVE_MAP:
+        cube = _labelled_cube()
+        cube.rotate(move)
+        perm = [None] * len(SLOTS)
+        for cubie in cube.cubies:
+            for face, label in cubie.faces.items():
+                #the sticker now sitting in this slot came from slot `label`
+                perm[SLOT_INDEX[(cubie.position, face)]] = SLOT_INDEX[label]
+        moves[move] = tuple(perm)
+    return moves
+
+#move string -> permutation, new_state[i] = state[perm[i]]
+MOVES = _build_moves()
+
+def from_cube(cube):
+    state = [None] * len(SLOTS)
+    for cubie in cube.cubies:
+        for face, colour in cubie.faces.items():
+            state[SLOT_INDEX[(cubie.position, face)]] = colour
+    return tuple(state)
+
+SOLVED = from_cube(Cube())
+
+def compose(*perms):
+    #a single permutation equal to applying perms left to right
+    result = IDENTITY
+    for perm in perms:
+        result = tuple([result[i] for i in perm])
+    return result
+
+def invert(perm):
+    result = [None] * len(perm)
+    for i, j in enumerate(perm):
+        result[j] = i
+    return tuple(result)
+
+def sequence_permutation(moves):
+    #moves is a list of MOVE_MAP strings, raises KeyError on an unknown move
+    return compose(*[MOVES[move] for move in moves])
+
+def apply(state, perm):
+    return tuple([state[i] for i in perm])
+
+def apply_move(state, move):
+    return apply(state, MOVES[move])
+
+def apply_sequence(state, moves):
+    for move in moves:
+        state = apply(state, MOVES[move])
+    return state
+
+def is_solved(state):
+    return state == SOLVED
+
+def _build_rotations():
+    #all 24 whole-cube orientations, found by walking X/Y/Z until no new center layouts appear
+    seen = {tuple(SOLVED[i] for i in CENTERS): IDENTITY}
+    frontier = [IDENTITY]
+    while frontier:
+        next_frontier = []
+        for perm in frontier:
+            for move in ("X", "Y", "Z"):
+                rotated = compose(perm, MOVES[move])
+                key = tuple(apply(SOLVED, rotated)[i] for i in CENTERS)
+                if key not in seen:
+                    seen[key] = rotated
+                    next_frontier.append(rotated)
+        frontier = next_frontier
+    return tuple(seen.values())
+
+ROTATIONS = _build_rotations()
+
+def reorient(perm):
+    #append the whole-cube rotation that puts every center back where it started
+    for rotation in ROTATIONS:
+        candidate = compose(perm, rotation)
+        if all(candidate[i] == i for i in CENTERS):
+            return candidate
+    return perm
@@ -2,6 +2,7 @@
 import pygame
 import math
 from cube import Cube
+from history import MoveHistory
 
 '''
 creates a 'fake' 3d representation of the cube. no actual 3d models or rendering are used,
@@ -237,6 +238,7 @@ def main():
     clock = pygame.time.Clock()
     
     cube = Cube()
+    history = MoveHistory(cube)
     renderer = CubeRenderer(cube)
     
     font = pygame.font.SysFont('Arial', 17)
@@ -270,13 +272,22 @@ def main():
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
                     cube = Cube()
+                    history = MoveHistory(cube)
                     renderer.cube = cube
                 elif event.key == pygame.K_q:
-                    cube.random_scramble(20)
+                    history.apply_sequence(" ".join(cube.scramble_moves(20)))
+                elif event.key == pygame.K_BACKSPACE:
+                    history.undo()
+                elif event.key == pygame.K_RETURN:
+                    history.redo()
+                elif event.key == pygame.K_HOME:
+                    history.seek(0)
+                elif event.key == pygame.K_END:
+                    history.seek(history.length)
                 else:
                     move = build_move(event)
                     if move:
-                        cube.rotate(move)
+                        history.apply(move)
         
         screen.fill((30, 30, 40))
         renderer.draw_cube(screen)
@@ -286,7 +297,8 @@ def main():
             "Keys: R/U/L/D/F/B - Move faces | M/E/S - Slice moves",
             "Hold Shift+Key for prime moves",
             "Hold Ctrl+Key for double moves",
-            "Space: Reset cube | Q: Random scramble"
+            "Space: Reset cube | Q: Random scramble",
+            "Backspace: Undo | Enter: Redo | Home/End: Jump to start/end"
         ]
         
         for i, text in enumerate(instructions):
@@ -297,6 +309,10 @@ def main():
         angle_surface = font.render(angle_text, True, (200, 200, 200))
         screen.blit(angle_surface, (10, 570))
         
+        history_text = f"Move {history.current.depth} of {history.length}"
+        history_surface = font.render(history_text, True, (200, 200, 200))
+        screen.blit(history_surface, (10, 545))
+        
         pygame.display.flip()
         clock.tick(60)
     
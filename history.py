@@ -0,0 +1,201 @@
+#history.py
+
+from cube import invert_move
+
+'''
+undo/redo and time travel for a Cube. every move is stored as a node in a tree along
+with its inverse, so undo is just applying the inverse move. every K moves a compact
+snapshot of the cube (Cube.get_state()) is kept so that jumping to any nearby move costs
+at most K replays (see max_snapshots). making a new move after an undo starts a new
+branch instead of throwing the old moves away, so nothing is ever lost (a redo tree)
+'''
+
+class HistoryNode:
+    def __init__(self, move, parent):
+        """
+        Args:
+            move, string: the move that leads from parent to this node (None for the root)
+            parent, HistoryNode: the previous state (None for the root)
+        """
+        self.move = move
+        self.inverse = invert_move(move) if move else None
+        self.parent = parent
+        self.children = []
+        self.depth = parent.depth + 1 if parent else 0
+
+        #the child we last came back from, this is where redo goes
+        self.redo_child = None
+
+    def path_from_root(self):
+        path = []
+        node = self
+        while node is not None:
+            path.append(node)
+            node = node.parent
+        path.reverse()
+        return path
+
+    def __repr__(self):
+        return f"HistoryNode(move={self.move}, depth={self.depth}, branches={len(self.children)})"
+
+
+class MoveHistory:
+    def __init__(self, cube, snapshot_interval=16, max_snapshots=256):
+        """
+        Args:
+            cube, Cube: the cube to track, its current state becomes the root
+            snapshot_interval, int: take a snapshot every K moves deep
+            max_snapshots, int: memory budget, past this the snapshot farthest (in depth) from
+                the current move is evicted. seeking costs at most K replays as long as the
+                target is within about max_snapshots * K / 2 moves of where you are, further
+                jumps fall back to an older snapshot or the root and replay from there
+        """
+        if snapshot_interval < 1:
+            raise ValueError("snapshot_interval must be at least 1")
+        if max_snapshots < 1:
+            raise ValueError("max_snapshots must be at least 1")
+
+        self.cube = cube
+        self.snapshot_interval = snapshot_interval
+        self.max_snapshots = max_snapshots
+
+        self.root = HistoryNode(None, None)
+        self.current = self.root
+        #len(self.timeline()), kept up to date so front-ends can show it every frame
+        self.length = 0
+
+        #the root snapshot is kept outside the budget so we can always fall back to it
+        self.root_state = cube.get_state()
+        #node -> state
+        self.snapshots = {}
+
+    def apply(self, move_str):
+        #apply a move to the cube and record it
+        if move_str not in self.cube.MOVE_MAP:
+            raise KeyError(move_str)
+        self.cube.rotate(move_str)
+        self.record(move_str)
+
+    def apply_sequence(self, sequence):
+        for move in sequence.split():
+            self.apply(move)
+
+    def record(self, move_str, snapshot=True):
+        """
+        record a move that has already been applied to the cube
+        pass snapshot=False if the cube has moved on since (e.g. recording a whole sequence
+        after applying it), otherwise the snapshot for this node would hold the wrong state
+        """
+        node = None
+        for child in self.current.children:
+            if child.move == move_str:
+                node = child
+                break
+
+        #same move as an existing branch, just walk down it
+        if node is None:
+            node = HistoryNode(move_str, self.current)
+            self.current.children.append(node)
+
+        #stepping off the redo line swaps its tail for whatever follows this node
+        if node is not self.current.redo_child:
+            self.length = node.depth + len(self.redo_path(node))
+
+        self.current.redo_child = node
+        self.current = node
+
+        if snapshot and node.depth % self.snapshot_interval == 0 and node not in self.snapshots:
+            self.take_snapshot(node)
+
+    def take_snapshot(self, node):
+        self.snapshots[node] = self.cube.get_state()
+        while len(self.snapshots) > self.max_snapshots:
+            #keep the snapshots around the current move, those are the ones seeks will use
+            farthest = max(self.snapshots, key=lambda n: abs(n.depth - self.current.depth))
+            del self.snapshots[farthest]
+
+    def can_undo(self):
+        return self.current.parent is not None
+
+    def can_redo(self):
+        return self.current.redo_child is not None
+
+    def undo(self):
+        if not self.can_undo():
+            return None
+        node = self.current
+        self.cube.rotate(node.inverse)
+        node.parent.redo_child = node
+        self.current = node.parent
+        return node.move
+
+    def redo(self):
+        if not self.can_redo():
+            return None
+        node = self.current.redo_child
+        self.cube.rotate(node.move)
+        self.current = node
+        return node.move
+
+    def redo_path(self, start=None):
+        #nodes reachable from start (the current node by default) by repeatedly calling redo
+        path = []
+        node = (start or self.current).redo_child
+        while node is not None:
+            path.append(node)
+            node = node.redo_child
+        return path
+
+    def timeline(self):
+        #the active line of moves: everything up to here plus what redo would replay
+        return self.current.path_from_root()[1:] + self.redo_path()
+
+    def seek(self, index):
+        """
+        jump to the state after `index` moves on the active timeline
+        restores the nearest snapshot at or before the target and replays from there
+        only moves along the active timeline, so self.length stays the same
+        """
+        timeline = self.timeline()
+        if index < 0 or index > len(timeline):
+            raise IndexError(f"move {index} is outside the history (0-{len(timeline)})")
+
+        target = timeline[index - 1] if index > 0 else self.root
+        if target is self.current:
+            return
+
+        #walking there move by move is sometimes cheaper than restoring a snapshot
+        distance = abs(target.depth - self.current.depth)
+
+        base = target
+        replay = []
+        while base is not self.root and base not in self.snapshots:
+            replay.append(base)
+            base = base.parent
+
+        if distance <= len(replay) + 1:
+            while self.current.depth > target.depth:
+                self.undo()
+            while self.current.depth < target.depth:
+                self.redo()
+            return
+
+        self.cube.set_state(self.root_state if base is self.root else self.snapshots[base])
+
+        for node in reversed(replay):
+            self.cube.rotate(node.move)
+            node.parent.redo_child = node
+        self.current = target
+
+    def moves(self):
+        #moves applied to get from the root to the current state
+        return [node.move for node in self.current.path_from_root()[1:]]
+
+    def print_history(self):
+        print("=== HISTORY ===")
+        print(f"position {self.current.depth} of {self.length}")
+        print("done:   " + (" ".join(self.moves()) or "-"))
+        print("redo:   " + (" ".join(node.move for node in self.redo_path()) or "-"))
+        branches = sum(1 for node in self.current.path_from_root() if len(node.children) > 1)
+        print(f"branch points: {branches} | snapshots: {len(self.snapshots)}/{self.max_snapshots}")
+        print("===============")
@@ -1,4 +1,5 @@
 from cube import Cube, Cubie
+from history import MoveHistory
 
 def main():
     print("=== Shav's terminal based Rubik's cube simulator ===")
@@ -8,15 +9,18 @@ def main():
     choice = input("select option 1/2:").strip()
     
     cube = Cube()
+    history = MoveHistory(cube)
     
     if choice == '2':
-        cube.random_scramble()
+        scramble = " ".join(cube.scramble_moves())
+        print("Scramble: " + scramble)
+        history.apply_sequence(scramble)
     
     print("\n initial cube state: ")
     cube.print_net()
     
     print("\nEnter moves or a sequence of moves, e.g. \"R'\" or \"R U R' U'\"")
-    print("type 'RESET' or 'QUIT'")
+    print("type 'UNDO', 'REDO', 'GOTO <n>', 'HISTORY', 'RESET' or 'QUIT'")
     
     #main loop
     while True:
@@ -24,16 +28,43 @@ def main():
         
         if cmd == "RESET":
             cube = Cube()
+            history = MoveHistory(cube)
             print("Reset cube to solved state.")
             cube.print_net()
             continue
         
+        if cmd == "UNDO":
+            move = history.undo()
+            print(f"Undid {move}." if move else "Nothing to undo.")
+            cube.print_net()
+            continue
+        
+        if cmd == "REDO":
+            move = history.redo()
+            print(f"Redid {move}." if move else "Nothing to redo.")
+            cube.print_net()
+            continue
+        
+        if cmd == "HISTORY":
+            history.print_history()
+            continue
+        
+        if cmd.startswith("GOTO"):
+            try:
+                history.seek(int(cmd[4:]))
+                print(f"Jumped to move {history.current.depth}.")
+                cube.print_net()
+            except (ValueError, IndexError) as e:
+                print(f"invalid position caught! {e}")
+            continue
+        
         if cmd == "QUIT":
             print("Quitter 🫵")
             break
         
         try:    
-            cube.parse_sequence(cmd)
+            history.apply_sequence(cmd)
+            print(f"sequence {cmd} parsed and applied!")
             cube.print_net()
         except Exception as e:
             print(f"invalid move or sequence caught! {e}")
@@ -0,0 +1,105 @@
+#test_cfop_solver.py
+
+import random
+
+import pytest
+
+import facelets
+from cfop_solver import CFOPSolver, random_scramble, simplify
+from cube import Cube
+
+
+@pytest.fixture(scope="module")
+def solver():
+    #the tables only need building once for the whole file
+    return CFOPSolver()
+
+
+def test_simplify():
+    assert simplify(["R", "R"]) == ["R2"]
+    assert simplify(["R", "R'"]) == []
+    assert simplify(["R", "U", "U'", "R"]) == ["R2"]
+    assert simplify(["U2", "U", "R'", "R'"]) == ["U'", "R2"]
+    assert simplify(["M", "M2", "F"]) == ["M'", "F"]
+
+
+def test_random_scrambles_are_solved(solver):
+    random.seed(4)
+    for _ in range(200):
+        scramble = random_scramble()
+        state = facelets.apply_sequence(facelets.SOLVED, scramble)
+        solution = solver.solve(state)
+        assert facelets.apply_sequence(state, solution.moves) == facelets.SOLVED
+
+
+def test_step_names_and_order(solver):
+    random.seed(5)
+    solution = solver.solve(facelets.apply_sequence(facelets.SOLVED, random_scramble()))
+    names = [step.name for step in solution.steps]
+
+    assert names[0] == "cross"
+    assert sorted(names[1:5]) == ["F2L BL", "F2L BR", "F2L FL", "F2L FR"]
+    assert names[5:] == ["OLL", "PLL"]
+    assert solution.moves == [move for step in solution.steps for move in step.moves]
+
+
+def test_solved_cube_needs_no_moves(solver):
+    solution = solver.solve(facelets.SOLVED)
+    assert len(solution.steps) == 7
+    assert solution.moves == []
+
+
+def test_solves_a_real_cube(solver):
+    cube = Cube()
+    cube.parse_sequence("R U R' U' F2 D L B' M")
+    cube.parse_sequence("M'")
+    solution = solver.solve(facelets.from_cube(cube))
+    for move in solution.moves:
+        cube.rotate(move)
+    assert facelets.from_cube(cube) == facelets.SOLVED
+
+
+def test_rotated_cube_is_rejected(solver):
+    cube = Cube()
+    cube.rotate("X")
+    with pytest.raises(ValueError):
+        solver.to_stickers(facelets.from_cube(cube))
+
+
+def cycle_stickers(state, slots):
+    #move the stickers in slots one place round, e.g. twisting a corner in place
+    state = list(state)
+    values = [state[i] for i in slots]
+    for i, value in zip(slots, values[1:] + values[:1]):
+        state[i] = value
+    return tuple(state)
+
+
+def piece(position):
+    return [i for i, (slot_position, face) in enumerate(facelets.SLOTS) if slot_position == position]
+
+
+def test_unsolvable_cubes_are_rejected(solver):
+    twisted_corner = cycle_stickers(facelets.SOLVED, piece((1, -1, 1)))
+    flipped_edge = cycle_stickers(facelets.SOLVED, piece((1, 0, 1)))
+    #swapping two edges leaves the corners and edges with different parity
+    swapped_edges = list(facelets.SOLVED)
+    for a, b in zip(piece((1, -1, 0)), piece((0, -1, 1))):
+        swapped_edges[a], swapped_edges[b] = swapped_edges[b], swapped_edges[a]
+
+    for state in (twisted_corner, flipped_edge, tuple(swapped_edges)):
+        with pytest.raises(ValueError, match="unsolvable cube"):
+            solver.solve(state)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_solve_batch_keeps_order(solver, jobs):
+    random.seed(6)
+    scrambles = [random_scramble() for _ in range(20)]
+    solutions = solver.solve_batch(scrambles, jobs=jobs, chunksize=3)
+
+    assert len(solutions) == len(scrambles)
+    for scramble, solution in zip(scrambles, solutions):
+        state = facelets.apply_sequence(facelets.SOLVED, scramble)
+        assert facelets.apply_sequence(state, solution.moves) == facelets.SOLVED
+        assert solution.moves == solver.solve(state).moves
@@ -0,0 +1,37 @@
+#test_facelets.py
+
+import random
+
+import facelets
+from cube import Cube
+
+
+def test_moves_match_cube():
+    random.seed(7)
+    moves = list(facelets.MOVES)
+    for _ in range(100):
+        #every move in MOVE_MAP, slices and full rotations included
+        sequence = [random.choice(moves) for _ in range(20)]
+        cube = Cube()
+        for move in sequence:
+            cube.rotate(move)
+        assert facelets.from_cube(cube) == facelets.apply_sequence(facelets.SOLVED, sequence)
+        assert facelets.apply(facelets.SOLVED, facelets.sequence_permutation(sequence)) == \
+            facelets.from_cube(cube)
+
+
+def test_compose_and_invert():
+    perm = facelets.sequence_permutation("R U F' M2 Y".split())
+    assert facelets.compose(perm, facelets.invert(perm)) == facelets.IDENTITY
+    assert facelets.compose(facelets.invert(perm), perm) == facelets.IDENTITY
+
+
+def test_rotations():
+    assert len(facelets.ROTATIONS) == 24
+    assert len({facelets.apply(facelets.SOLVED, rotation) for rotation in facelets.ROTATIONS}) == 24
+
+
+def test_reorient_puts_centers_home():
+    perm = facelets.reorient(facelets.sequence_permutation("R X U Y' F Z2".split()))
+    state = facelets.apply(facelets.SOLVED, perm)
+    assert all(state[i] == facelets.SOLVED[i] for i in facelets.CENTERS)
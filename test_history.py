@@ -0,0 +1,174 @@
+#test_history.py
+
+import random
+
+import pytest
+
+from cube import Cube, invert_move
+from history import MoveHistory
+
+
+def states_for(moves):
+    #state after each prefix of moves, applied to a fresh cube
+    cube = Cube()
+    states = [cube.get_state()]
+    for move in moves:
+        cube.rotate(move)
+        states.append(cube.get_state())
+    return states
+
+
+def test_invert_move():
+    assert invert_move("R") == "R'"
+    assert invert_move("R'") == "R"
+    assert invert_move("M2") == "M2"
+    assert invert_move("X") == "X'"
+
+
+def test_undo_redo_round_trip():
+    moves = "R U R' U' F2 M X' S".split()
+    cube = Cube()
+    history = MoveHistory(cube)
+    history.apply_sequence(" ".join(moves))
+    states = states_for(moves)
+
+    for n in range(len(moves), 0, -1):
+        assert history.undo() == moves[n - 1]
+        assert cube.get_state() == states[n - 1]
+    assert history.undo() is None
+
+    for n in range(1, len(moves) + 1):
+        assert history.redo() == moves[n - 1]
+        assert cube.get_state() == states[n]
+    assert history.redo() is None
+
+
+def test_seek_matches_fresh_cube():
+    random.seed(1)
+    cube = Cube()
+    moves = [random.choice(list(cube.MOVE_MAP)) for _ in range(60)]
+    history = MoveHistory(cube, snapshot_interval=4)
+    history.apply_sequence(" ".join(moves))
+    states = states_for(moves)
+
+    for index in [0, 60, 5, 33, 32, 59, 1, 17, 17, 44]:
+        history.seek(index)
+        assert history.current.depth == index
+        assert cube.get_state() == states[index]
+
+
+def test_seek_out_of_range():
+    history = MoveHistory(Cube())
+    history.apply_sequence("R U")
+    with pytest.raises(IndexError):
+        history.seek(3)
+    with pytest.raises(IndexError):
+        history.seek(-1)
+
+
+def test_record_after_applying_does_not_poison_snapshots():
+    #regression: recording a sequence that was applied up front used to snapshot the end state
+    moves = "R U F D L B R' U' F' D'".split()
+    cube = Cube()
+    history = MoveHistory(cube, snapshot_interval=4)
+    for move in moves:
+        cube.rotate(move)
+    for move in moves:
+        history.record(move, snapshot=False)
+
+    history.seek(5)
+    assert cube.get_state() == states_for(moves)[5]
+
+
+def test_scramble_through_apply_seeks_correctly():
+    cube = Cube()
+    history = MoveHistory(cube, snapshot_interval=4)
+    moves = cube.scramble_moves(30)
+    history.apply_sequence(" ".join(moves))
+
+    history.seek(5)
+    assert cube.get_state() == states_for(moves)[5]
+
+
+def test_branching_keeps_old_line():
+    cube = Cube()
+    history = MoveHistory(cube)
+    history.apply_sequence("R U F")
+    history.undo()
+    history.undo()
+    history.apply("L")
+
+    assert history.moves() == ["R", "L"]
+    assert len(history.root.children[0].children) == 2
+
+    #going back to the branch point and taking the old move again reuses its node
+    history.undo()
+    history.apply("U")
+    assert len(history.root.children[0].children) == 2
+    assert history.redo() == "F"
+    assert cube.get_state() == states_for("R U F".split())[3]
+
+
+def test_snapshot_budget_is_respected():
+    random.seed(2)
+    cube = Cube()
+    moves = [random.choice(list(cube.MOVE_MAP)) for _ in range(100)]
+    history = MoveHistory(cube, snapshot_interval=2, max_snapshots=5)
+    history.apply_sequence(" ".join(moves))
+    states = states_for(moves)
+
+    assert len(history.snapshots) == 5
+    for index in [3, 99, 50, 0, 77]:
+        history.seek(index)
+        assert len(history.snapshots) <= 5
+        assert cube.get_state() == states[index]
+
+
+def test_invalid_move_is_not_recorded():
+    cube = Cube()
+    history = MoveHistory(cube)
+    with pytest.raises(KeyError):
+        history.apply("Q")
+    assert history.current is history.root
+    assert cube.get_state() == Cube().get_state()
+
+
+def test_eviction_keeps_snapshots_near_current_move():
+    random.seed(3)
+    cube = Cube()
+    moves = [random.choice(list(cube.MOVE_MAP)) for _ in range(100)]
+    history = MoveHistory(cube, snapshot_interval=2, max_snapshots=5)
+    history.apply_sequence(" ".join(moves))
+
+    #branch off early on, the snapshots at the far end of the old line go first
+    history.seek(10)
+    history.apply_sequence("R U R' U'")
+    assert sorted(node.depth for node in history.snapshots) == [12, 14, 92, 94, 96]
+
+    #every seek near the current move replays at most K moves
+    history.apply_sequence("F R F' R' F R")
+    for index in range(12, 21):
+        base = history.timeline()[index - 1]
+        replays = 0
+        while base is not history.root and base not in history.snapshots:
+            base = base.parent
+            replays += 1
+        assert replays < history.snapshot_interval
+
+
+def test_length_tracks_timeline():
+    random.seed(4)
+    cube = Cube()
+    history = MoveHistory(cube, snapshot_interval=3)
+    moves = list(cube.MOVE_MAP)
+    for _ in range(300):
+        action = random.choice(["apply", "apply", "undo", "redo", "seek"])
+        if action == "apply":
+            history.apply(random.choice(moves[:4]))
+        elif action == "undo":
+            history.undo()
+        elif action == "redo":
+            history.redo()
+        else:
+            history.seek(random.randint(0, history.length))
+        assert history.length == len(history.timeline())
@@ -0,0 +1,134 @@
+#test_verify_algorithms.py
+
+import pytest
+
+import facelets
+from verify_algorithms import canonical_key, parse_algorithm, read_entries, verify_files
+
+SUNE = "R U R' U R U2 R'"
+
+
+def key_for(text, equivalence):
+    return canonical_key(facelets.sequence_permutation(parse_algorithm(text)), equivalence)
+
+
+def test_parse_plain_sequence():
+    assert parse_algorithm("(R U R' U') y R2'") == ["R", "U", "R'", "U'", "Y", "R2"]
+
+
+def test_parse_commutator_and_conjugate():
+    assert parse_algorithm("[R U R', D]") == "R U R' D R U' R' D'".split()
+    assert parse_algorithm("[F: R U R' U']") == "F R U R' U' F'".split()
+    assert parse_algorithm("[R: [U, D]] U") == "R U D U' D' R' U".split()
+
+
+def test_parse_wide_moves():
+    assert parse_algorithm("r U R' U' r' F R F'") == "R M' U R' U' R' M F R F'".split()
+    assert parse_algorithm("Rw2 f u' Dw") == "R2 M2 F S U' E D E".split()
+    assert parse_algorithm("Lw' b2'") == "L' M' B2 S2".split()
+
+
+def test_parse_repeat_groups():
+    assert parse_algorithm("(R U R' U')2") == "R U R' U' R U R' U'".split()
+    assert parse_algorithm("F (R U R' U')3 F'") == ["F"] + "R U R' U'".split() * 3 + ["F'"]
+    assert parse_algorithm("(R U)' (M2 U)2'") == "U' R' U' M2 U' M2".split()
+    assert parse_algorithm("[(R U R' U')2, D]")[:8] == "R U R' U' R U R' U'".split()
+
+
+def test_parse_errors():
+    with pytest.raises(KeyError):
+        parse_algorithm("R Q")
+    with pytest.raises(KeyError):
+        parse_algorithm("Rw3")
+    with pytest.raises(ValueError):
+        parse_algorithm("[R, U")
+    with pytest.raises(ValueError):
+        parse_algorithm("R U]")
+    with pytest.raises(ValueError):
+        parse_algorithm("(R U R' U'")
+    with pytest.raises(ValueError):
+        parse_algorithm("R U)2")
+
+
+def test_headers_do_not_swallow_commutators(tmp_path):
+    path = tmp_path / "algs.txt"
+    path.write_text(
+        "[OLL]\n"
+        "Sune: R U R' U R U2 R'\n"
+        "[R U R', D]\n"
+        "A9: [R U R', D]\n"
+        "[F: R U R' U']\n"
+    )
+    entries = list(read_entries([str(path)]))
+
+    assert [entry['case'] for entry in entries] == ['OLL'] * 4
+    assert [entry['moves'] for entry in entries] == [
+        "R U R' U R U2 R'", "[R U R', D]", "[R U R', D]", "[F: R U R' U']"
+    ]
+    assert entries[2]['name'] == "A9"
+    assert entries[3]['name'] == entries[3]['source']
+
+
+def test_verify_files_groups_duplicates_in_batches(tmp_path):
+    path = tmp_path / "algs.txt"
+    lines = ["[PLL]"]
+    for n in range(50):
+        lines.append(f"T{n}: R U R' U' R' F R2 U' R' U' R U R' F'")
+    lines.append("bad: R U R'")
+    lines.append("junk: R Q")
+    path.write_text("\n".join(lines) + "\n")
+
+    serial = verify_files([str(path)], jobs=1)
+    parallel = verify_files([str(path)], jobs=2, chunksize=4)
+
+    for report in (serial, parallel):
+        assert report['total'] == 52
+        assert sorted(len(group) for group in report['groups'].values()) == [1, 50]
+        assert [entry[1] for entry in report['out_of_case']] == ["bad"]
+        assert [entry[1] for entry in report['errors']] == ["junk"]
+    assert serial['groups'] == parallel['groups']
+
+
+def test_unknown_case_is_reported(tmp_path):
+    path = tmp_path / "algs.txt"
+    path.write_text(
+        "no header: R U R'\n"
+        "[F2L]\n"
+        "R U R'\n"
+        "U R U' R'\n"
+        "[OLL 27]\n"
+        "R U R' U R U2 R'\n"
+        "[OLL]\n"
+        "R U R' U R U2 R'\n"
+    )
+    report = verify_files([str(path)], jobs=1)
+    assert report['unchecked_cases'] == {'F2L': 2, 'OLL 27': 1}
+
+
+def test_auf_equivalence():
+    assert key_for(SUNE, 'exact') != key_for(f"U {SUNE} U'", 'exact')
+    assert key_for(SUNE, 'auf') == key_for(f"U {SUNE} U'", 'auf')
+    assert key_for(SUNE, 'auf') == key_for(f"{SUNE} U2", 'auf')
+    assert key_for(SUNE, 'auf') != key_for("R U2 R' U' R U' R'", 'auf')
+
+
+def test_rotation_equivalence():
+    conjugated = f"x {SUNE} x'"
+    assert key_for(SUNE, 'exact') != key_for(conjugated, 'exact')
+    assert key_for(SUNE, 'auf') != key_for(conjugated, 'auf')
+    assert key_for(SUNE, 'rotation') == key_for(conjugated, 'rotation')
+    assert key_for(SUNE, 'rotation') == key_for(f"y {SUNE} y", 'rotation')
+
+
+def test_rotations_count_as_no_effect(tmp_path):
+    path = tmp_path / "algs.txt"
+    path.write_text(
+        "[OLL]\n"
+        "turn: x\n"
+        "twice: y y\n"
+        "nothing: R R'\n"
+        "sune: y R U R' U R U2 R' y'\n"
+    )
+    report = verify_files([str(path)], jobs=1)
+    assert [entry[1] for entry in report['identity']] == ["turn", "twice", "nothing"]
+    assert report['out_of_case'] == []
@@ -0,0 +1,330 @@
+#verify_algorithms.py
+
+import argparse
+import hashlib
+import itertools
+import multiprocessing
+import os
+import re
+
+import facelets
+from cube import invert_move
+
+'''
+bulk checker for algorithm library files. each file is read lazily, one algorithm per line:
+
+    # comments and blank lines are skipped
+    [OLL]                              <- declares the case for the lines below it
+    OLL 27: R U R' U R U2 R'           <- optional "name:" before the moves
+    (R U R' U') x y'                   <- x/y/z mean X/Y/Z
+    (R U R' U')3                       <- a group repeated 3 times, (...)' inverts it
+    r U R' U' r' F R F'                <- wide moves (r or Rw) become face + slice, r == R M'
+    A9: [R U R', D]                    <- commutator, A B A' B'
+    [F: R U R' U']                     <- conjugate, A B A'
+
+a line in square brackets is only a case header when it has no ',' or ':' in it
+
+every algorithm is applied to a solved cube with the facelet permutations (facelets.py),
+fingerprinted, and grouped with every other algorithm that has the same effect. entries that
+touch pieces outside their declared case, contain unknown moves, or do nothing are flagged
+'''
+
+#facelets each case is allowed to change, everything else must end up solved
+#OLL style cases may do anything to the top layer, PLL must also keep the U face U coloured
+_TOP_LAYER = frozenset(i for i, (position, face) in enumerate(facelets.SLOTS) if position[1] == 1)
+_TOP_SIDES = frozenset(i for i in _TOP_LAYER if facelets.SLOTS[i][1] != 'y+')
+
+CASE_SCOPES = {
+    'OLL': _TOP_LAYER,
+    'COLL': _TOP_LAYER,
+    'ZBLL': _TOP_LAYER,
+    'LL': _TOP_LAYER,
+    'PLL': _TOP_SIDES,
+}
+
+EQUIVALENCES = ('exact', 'auf', 'rotation')
+
+_AUF_PERMS = tuple(facelets.MOVES[move] if move else facelets.IDENTITY for move in ("", "U", "U'", "U2"))
+
+#(colours after the left hand permutation, right hand permutation) for every pair that
+#canonical_key tries, so each candidate is a single pass over the 54 stickers
+_AUF = tuple((facelets.apply(facelets.SOLVED, pre), post) for pre in _AUF_PERMS for post in _AUF_PERMS)
+_CONJUGATES = tuple(
+    (facelets.apply(facelets.SOLVED, facelets.invert(rotation)), rotation)
+    for rotation in facelets.ROTATIONS
+)
+
+#wide move -> the face and slice turning with it
+WIDE_MOVES = {
+    'r': ('R', "M'"),
+    'l': ('L', 'M'),
+    'u': ('U', "E'"),
+    'd': ('D', 'E'),
+    'f': ('F', 'S'),
+    'b': ('B', "S'"),
+}
+
+def _normalise(token):
+    #one library token -> list of MOVE_MAP strings
+    wide = re.fullmatch(r"([RLUDFB])w(.*)|([rludfb])(.*)", token)
+    if wide:
+        face = (wide.group(1) or wide.group(3)).lower()
+        suffix = wide.group(2) if wide.group(1) else wide.group(4)
+        if suffix not in ('', "'", '2', "2'"):
+            raise KeyError(token)
+        layers = WIDE_MOVES[face]
+        if suffix == "'":
+            return [invert_move(layer) for layer in layers]
+        if suffix:
+            return [layer[0] + '2' for layer in layers]
+        return list(layers)
+
+    if token[0] in 'xyz':
+        token = token[0].upper() + token[1:]
+    #R2' is the same as R2
+    if token.endswith("2'"):
+        token = token[:-1]
+    if token not in facelets.MOVES:
+        raise KeyError(token)
+    return [token]
+
+def _inverse(moves):
+    return [invert_move(move) for move in reversed(moves)]
+
+def _is_closing(token):
+    return token in (',', ':', ']') or token.startswith(')')
+
+def _parse_moves(tokens, pos):
+    #reads moves until a ',', ':', ']' or ')' at this depth, returns (moves, next position)
+    moves = []
+    while pos < len(tokens) and not _is_closing(tokens[pos]):
+        token = tokens[pos]
+        if token == '(':
+            group, pos = _parse_moves(tokens, pos + 1)
+            if pos >= len(tokens) or not tokens[pos].startswith(')'):
+                raise ValueError("unclosed parenthesis")
+            #")3" repeats the group, ")'" inverts it, ")2'" does both
+            suffix = tokens[pos][1:]
+            if suffix.endswith("'"):
+                group, suffix = _inverse(group), suffix[:-1]
+            moves += group * (int(suffix) if suffix else 1)
+            pos += 1
+            continue
+
+        if token != '[':
+            moves += _normalise(token)
+            pos += 1
+            continue
+
+        first, pos = _parse_moves(tokens, pos + 1)
+        if pos >= len(tokens) or tokens[pos] not in (',', ':'):
+            raise ValueError("expected ',' or ':' inside brackets")
+        separator = tokens[pos]
+        second, pos = _parse_moves(tokens, pos + 1)
+        if pos >= len(tokens) or tokens[pos] != ']':
+            raise ValueError("unclosed bracket")
+        pos += 1
+
+        moves += first + second + _inverse(first)
+        if separator == ',':
+            moves += _inverse(second)
+    return moves, pos
+
+def parse_algorithm(text):
+    """
+    text: an algorithm as written in a library, e.g. "(R U R' U')2 y R2'" or "[R U R', D]"
+    returns: list of MOVE_MAP strings
+    raises KeyError on an unknown move, ValueError on broken bracket notation
+    """
+    tokens = re.findall(r"\)\d*'?|[\[\](,:]|[^\s\[\](),:]+", text)
+    moves, pos = _parse_moves(tokens, 0)
+    if pos != len(tokens):
+        raise ValueError(f"unexpected '{tokens[pos]}'")
+    return moves
+
+def read_entries(paths):
+    #generator, yields one dict per algorithm without loading whole files
+    for path in paths:
+        case = None
+        with open(path, encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.split('#', 1)[0].strip()
+                if not line:
+                    continue
+                if line.startswith('[') and line.endswith(']') and not any(c in line for c in ',:'):
+                    case = line[1:-1].strip().upper() or None
+                    continue
+
+                #a "name:" prefix, as long as the colon is not part of a conjugate
+                name, sep, moves = line.partition(':')
+                if '[' in name:
+                    name, sep, moves = '', '', line
+                source = f"{path}:{line_no}"
+                yield {
+                    'name': name.strip() if sep else source,
+                    'source': source,
+                    'moves': moves.strip(),
+                    'case': case,
+                }
+
+def _key(perm):
+    return ''.join(facelets.apply(facelets.SOLVED, perm))
+
+def canonical_key(perm, equivalence='exact'):
+    """
+    perm: the algorithm's facelet permutation
+    returns: a string that is equal for every algorithm considered equivalent
+        exact    - identical effect on the cube
+        auf      - identical up to U turns before and after
+        rotation - identical up to a whole-cube rotation of the setup (and any net rotation)
+    """
+    if equivalence == 'exact':
+        return _key(perm)
+
+    perm = facelets.reorient(perm)
+    if equivalence == 'auf':
+        pairs = _AUF
+    elif equivalence == 'rotation':
+        pairs = _CONJUGATES
+    else:
+        raise ValueError(f"unknown equivalence {equivalence}")
+    #same as _key(compose(left, perm, right)), with left already applied to SOLVED
+    return min(''.join([colours[perm[i]] for i in right]) for colours, right in pairs)
+
+def fingerprint(key):
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+def disturbed_pieces(perm, case):
+    #cubie positions changed outside the declared case, empty when fine or the case is not in
+    #CASE_SCOPES (verify_files lists those as warnings)
+    scope = CASE_SCOPES.get(case)
+    if scope is None:
+        return []
+    state = facelets.apply(facelets.SOLVED, facelets.reorient(perm))
+    positions = set()
+    for i, colour in enumerate(state):
+        if i not in scope and colour != facelets.SOLVED[i]:
+            positions.add(facelets.SLOTS[i][0])
+    return sorted(positions)
+
+def verify_entry(entry, equivalence='exact'):
+    #runs in the worker processes, returns the entry with its results filled in
+    result = dict(entry, fingerprint=None, disturbed=[], error=None, identity=False)
+    try:
+        perm = facelets.sequence_permutation(parse_algorithm(entry['moves']))
+    except KeyError as e:
+        result['error'] = f"unknown move {e}"
+        return result
+    except ValueError as e:
+        result['error'] = f"bad notation: {e}"
+        return result
+
+    result['fingerprint'] = fingerprint(canonical_key(perm, equivalence))
+    result['disturbed'] = disturbed_pieces(perm, entry['case'])
+    #a pure rotation counts as doing nothing, like in disturbed_pieces and canonical_key
+    result['identity'] = facelets.apply(facelets.SOLVED, facelets.reorient(perm)) == facelets.SOLVED
+    return result
+
+def _verify_job(job):
+    entry, equivalence = job
+    return verify_entry(entry, equivalence)
+
+def verify_files(paths, equivalence='exact', jobs=None, chunksize=64):
+    """
+    streams every algorithm in paths through verify_entry, in parallel when jobs != 1
+    entries are read and handed out in batches of a few chunks per worker, so the algorithms
+    themselves are never all in memory at once. the report still keeps a (source, name) tuple
+    per entry for the duplicate groups, so memory grows by one small tuple per entry
+    returns: a report dict (see print_report)
+    """
+    if equivalence not in EQUIVALENCES:
+        raise ValueError(f"unknown equivalence {equivalence}")
+
+    report = {
+        'total': 0,
+        #fingerprint -> [(source, name), ...]
+        'groups': {},
+        'errors': [],
+        'out_of_case': [],
+        'identity': [],
+        #case header -> number of entries under it that had no scope to check against
+        'unchecked_cases': {},
+    }
+    jobs_iter = ((entry, equivalence) for entry in read_entries(paths))
+
+    if jobs == 1:
+        _collect(report, map(_verify_job, jobs_iter))
+        return report
+
+    workers = jobs or os.cpu_count() or 1
+    batch_size = workers * chunksize * 2
+    with multiprocessing.Pool(workers) as pool:
+        while True:
+            #Pool.imap would read the whole input up front, so only give it one batch at a time
+            batch = list(itertools.islice(jobs_iter, batch_size))
+            if not batch:
+                break
+            _collect(report, pool.imap(_verify_job, batch, chunksize))
+    return report
+
+def _collect(report, results):
+    for result in results:
+        report['total'] += 1
+        entry = (result['source'], result['name'])
+        case = result['case']
+        if case is not None and case not in CASE_SCOPES:
+            report['unchecked_cases'][case] = report['unchecked_cases'].get(case, 0) + 1
+        if result['error']:
+            report['errors'].append(entry + (result['error'],))
+            continue
+        if result['disturbed']:
+            report['out_of_case'].append(entry + (result['case'], result['disturbed']))
+        if result['identity']:
+            report['identity'].append(entry)
+        report['groups'].setdefault(result['fingerprint'], []).append(entry)
+
+def print_report(report):
+    duplicates = [(key, group) for key, group in report['groups'].items() if len(group) > 1]
+
+    print("=== ALGORITHM REPORT ===")
+    print(f"algorithms: {report['total']} | unique effects: {len(report['groups'])}")
+
+    if report['unchecked_cases']:
+        print(f"\nwarnings: {len(report['unchecked_cases'])}")
+        known = ", ".join(CASE_SCOPES)
+        for case, count in report['unchecked_cases'].items():
+            print(f"  unknown case [{case}], {count} entries not checked for out of case moves (known: {known})")
+
+    print(f"\ninvalid: {len(report['errors'])}")
+    for source, name, error in report['errors']:
+        print(f"  {source} {name}: {error}")
+
+    print(f"\nout of case: {len(report['out_of_case'])}")
+    for source, name, case, disturbed in report['out_of_case']:
+        pieces = ", ".join(str(position) for position in disturbed)
+        print(f"  {source} {name} [{case}]: disturbs {pieces}")
+
+    print(f"\nno effect: {len(report['identity'])}")
+    for source, name in report['identity']:
+        print(f"  {source} {name}")
+
+    print(f"\nduplicate groups: {len(duplicates)}")
+    for key, group in duplicates:
+        print(f"  {key} ({len(group)}):")
+        for source, name in group:
+            print(f"    {source} {name}")
+    print("========================")
+
+def main():
+    parser = argparse.ArgumentParser(description="verify and deduplicate algorithm library files")
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--equivalence', choices=EQUIVALENCES, default='exact')
+    parser.add_argument('--jobs', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--chunksize', type=int, default=64)
+    args = parser.parse_args()
+
+    report = verify_files(args.files, args.equivalence, args.jobs, args.chunksize)
+    print_report(report)
+
+if __name__ == "__main__":
+    main()